@@ -0,0 +1 @@
+"""CivicForge source package"""
@@ -4,47 +4,165 @@ Main API application for CivicForge
 Provides endpoints for conversation management and opportunity matching.
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from datetime import datetime
-import uuid
+import hashlib
+import os
+import secrets
+import time
+
+import orjson
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
 
-from ..core.conversation import DialogManager, ConversationState
-from ..core.conversation.context_tracker import ContextTracker
 from ..core.matching import (
     OpportunityMatcher, 
     Opportunity,
     VolunteerProfile,
     MatchConfidence
 )
-from ..core.interfaces import MockLocalController, MockPrivacyManager
+from ..core.interfaces import MockPrivacyManager
+from .storage import create_store, new_dialog_manager
+
+
+# Sessions, opportunities and volunteers live in the store.
+# Set REDIS_URL to share state between workers; otherwise it is in-memory.
+store = create_store()
+
+# Per-client rate limits, counted in Redis when it is configured so that
+# every worker enforces the same budget
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.environ.get("REDIS_URL", "memory://")
+)
+
+# Opportunity listings are cached until the next opportunity is created
+OPPORTUNITY_LIST_CACHE = "opps_list"
+OPPORTUNITY_LIST_TTL_SECONDS = 30
+
+CONFIDENCE_LEVELS = {
+    "high": MatchConfidence.HIGH,
+    "medium": MatchConfidence.MEDIUM,
+    "low": MatchConfidence.LOW
+}
+
+# Health probes may arrive several times a second; reuse the body for this long
+HEALTH_CACHE_SECONDS = 1.0
+_health = {"expires": 0.0, "body": None}
+
+# One matcher serves every request. Its privacy manager records a budget per
+# volunteer it has matched, so that map is capped to the most recent users.
+MATCHER_BUDGET_USERS = 10000
+matcher = OpportunityMatcher(privacy_manager=MockPrivacyManager(max_users=MATCHER_BUDGET_USERS))
+
+
+# Same options as FastAPI's own ORJSONResponse, so non-str dict keys still encode
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the stdlib json module"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def not_modified_response(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """An empty 304 if the client's copy matches etag, otherwise None"""
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = [tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")]
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def json_response(body: Dict, etag: str, cache_control: str) -> Response:
+    """Serialized JSON response carrying an ETag and Cache-Control"""
+    content = orjson.dumps(body, option=ORJSON_OPTIONS)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def conditional_json_response(request: Request, body: Dict, cache_control: str) -> Response:
+    """JSON response with an ETag hashed from the body, or an empty 304 if the client's copy is current"""
+    content = orjson.dumps(body, option=ORJSON_OPTIONS)
+    etag = '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+    not_modified = not_modified_response(request, etag, cache_control)
+    if not_modified:
+        return not_modified
+    
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def prewarm():
+    """Run one dialog turn and one match so first requests skip one-time setup"""
+    dialog_manager = new_dialog_manager()
+    dialog_manager.process_turn("I want to volunteer on Saturday mornings")
+    
+    volunteer = VolunteerProfile(
+        user_id="prewarm",
+        skills=["teaching"],
+        interests=[],
+        availability=[{"day": "saturday", "period": "morning"}],
+        preferred_locations=["downtown"]
+    )
+    opportunity = Opportunity(
+        id="prewarm",
+        title="Prewarm",
+        description="Startup check",
+        organization="CivicForge",
+        skills_needed=["teaching"],
+        location="Downtown",
+        time_commitment={"day": "saturday", "period": "morning"},
+        created_at=datetime.now()
+    )
+    OpportunityMatcher().find_matches(volunteer, [opportunity])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Loads the intent model (when installed) before traffic arrives
+    await run_in_threadpool(prewarm)
+    yield
+    await store.close()
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="CivicForge API",
     description="Conversational AI for civic engagement",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# Allowed browser origins, comma separated (defaults to the local dev frontend)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "http://localhost:5173").split(",")
+    if origin.strip()
+]
 
-# Add CORS middleware for development
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure properly for production
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 
-# In-memory storage for development (replace with database in production)
-sessions = {}
-opportunities = {}
-volunteers = {}
-
-
 # Pydantic models for API
 class ConversationInput(BaseModel):
     message: str
@@ -84,25 +202,26 @@ class MatchRequest(BaseModel):
 
 
 # Dependency to get or create session
-def get_session(session_id: Optional[str] = None) -> Dict:
-    if session_id and session_id in sessions:
-        return sessions[session_id]
+async def get_session(session_id: Optional[str] = None) -> Dict:
+    if session_id:
+        session = await store.get_session(session_id)
+        if session:
+            return session
     
     # Create new session
-    new_session_id = str(uuid.uuid4())
-    dialog_manager = DialogManager(
-        context_tracker=ContextTracker(),
-        local_controller=MockLocalController(),
-        privacy_manager=MockPrivacyManager()
-    )
-    
-    sessions[new_session_id] = {
-        "id": new_session_id,
-        "dialog_manager": dialog_manager,
+    return {
+        "id": secrets.token_hex(16),
+        "dialog_manager": new_dialog_manager(),
         "created_at": datetime.now()
     }
-    
-    return sessions[new_session_id]
+
+
+# Dependency for endpoints that need an existing session
+async def require_session(session_id: str) -> Dict:
+    session = await store.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
 
 
 @app.get("/")
@@ -121,18 +240,21 @@ async def root():
 
 
 @app.post("/api/conversation", response_model=ConversationResponse)
-async def process_conversation(input_data: ConversationInput):
+@limiter.limit("30/minute")
+async def process_conversation(request: Request, input_data: ConversationInput):
     """Process a conversation turn"""
-    session = get_session(input_data.session_id)
+    session = await get_session(input_data.session_id)
     dialog_manager = session["dialog_manager"]
     
-    # Process the user input
-    response = dialog_manager.process_turn(input_data.message)
+    # Process the user input (NLP is CPU-bound, keep it off the event loop)
+    response = await run_in_threadpool(dialog_manager.process_turn, input_data.message)
+    await store.save_session(session)
     
     # Get conversation summary
     summary = dialog_manager.get_conversation_summary()
     
-    return ConversationResponse(
+    # Built from server-side data, so field validation is skipped
+    return ConversationResponse.model_construct(
         response=response,
         session_id=session["id"],
         state=summary["state"],
@@ -141,31 +263,27 @@ async def process_conversation(input_data: ConversationInput):
 
 
 @app.get("/api/conversation/{session_id}/summary")
-async def get_conversation_summary(session_id: str):
+async def get_conversation_summary(session: Dict = Depends(require_session)):
     """Get summary of a conversation session"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    dialog_manager = sessions[session_id]["dialog_manager"]
+    dialog_manager = session["dialog_manager"]
     return dialog_manager.get_conversation_summary()
 
 
 @app.post("/api/conversation/{session_id}/reset")
-async def reset_conversation(session_id: str):
+async def reset_conversation(session: Dict = Depends(require_session)):
     """Reset a conversation session"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    dialog_manager = sessions[session_id]["dialog_manager"]
+    dialog_manager = session["dialog_manager"]
     dialog_manager.reset_conversation()
+    await store.save_session(session)
     
     return {"message": "Conversation reset successfully"}
 
 
 @app.post("/api/opportunities", response_model=Dict)
-async def create_opportunity(opportunity: OpportunityCreate):
+@limiter.limit("60/minute")
+async def create_opportunity(request: Request, opportunity: OpportunityCreate):
     """Create a new volunteer opportunity"""
-    opp_id = f"opp_{uuid.uuid4()}"
+    opp_id = "opp_" + secrets.token_hex(16)
     
     new_opportunity = Opportunity(
         id=opp_id,
@@ -180,7 +298,8 @@ async def create_opportunity(opportunity: OpportunityCreate):
         max_volunteers=opportunity.max_volunteers
     )
     
-    opportunities[opp_id] = new_opportunity
+    await store.add_opportunity(new_opportunity, matcher.skill_index_keys(new_opportunity.skills_needed))
+    await store.clear_cached(OPPORTUNITY_LIST_CACHE)
     
     return {
         "id": opp_id,
@@ -194,43 +313,47 @@ async def create_opportunity(opportunity: OpportunityCreate):
 
 
 @app.get("/api/opportunities")
-async def list_opportunities(limit: int = 10, offset: int = 0):
+async def list_opportunities(limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)):
     """List all opportunities"""
-    opp_list = list(opportunities.values())
+    cache_key = f"{limit}:{offset}"
+    cached, cache_version = await store.get_cached(OPPORTUNITY_LIST_CACHE, cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
     
-    # Sort by created_at descending
-    opp_list.sort(key=lambda x: x.created_at, reverse=True)
+    total, listings = await store.list_opportunities(offset, limit)
     
-    # Apply pagination
-    paginated = opp_list[offset:offset + limit]
-    
-    return {
-        "total": len(opportunities),
+    result = {
+        "total": total,
         "limit": limit,
         "offset": offset,
-        "opportunities": [
-            {
-                "id": opp.id,
-                "title": opp.title,
-                "organization": opp.organization,
-                "skills_needed": opp.skills_needed,
-                "location": opp.location,
-                "time_commitment": opp.time_commitment,
-                "created_at": opp.created_at.isoformat()
-            }
-            for opp in paginated
-        ]
+        "opportunities": listings
     }
+    # Pages past the end are cheap to build, so only real pages are cached
+    if listings:
+        await store.set_cached(
+            OPPORTUNITY_LIST_CACHE, cache_key, result, OPPORTUNITY_LIST_TTL_SECONDS, cache_version
+        )
+    
+    # The body is already plain JSON data, so skip FastAPI's jsonable_encoder pass
+    return ORJSONResponse(result)
 
 
 @app.get("/api/opportunities/{opportunity_id}")
-async def get_opportunity(opportunity_id: str):
+async def get_opportunity(request: Request, opportunity_id: str):
     """Get a specific opportunity"""
-    if opportunity_id not in opportunities:
+    opp = await store.get_opportunity(opportunity_id)
+    if not opp:
         raise HTTPException(status_code=404, detail="Opportunity not found")
     
-    opp = opportunities[opportunity_id]
-    return {
+    # Opportunities are not edited after creation, so the id identifies the
+    # representation and clients may reuse it briefly
+    etag = f'"{opp.id}"'
+    cache_control = "private, max-age=60"
+    not_modified = not_modified_response(request, etag, cache_control)
+    if not_modified:
+        return not_modified
+    
+    return json_response({
         "id": opp.id,
         "title": opp.title,
         "description": opp.description,
@@ -242,11 +365,12 @@ async def get_opportunity(opportunity_id: str):
         "active": opp.active,
         "min_volunteers": opp.min_volunteers,
         "max_volunteers": opp.max_volunteers
-    }
+    }, etag, cache_control)
 
 
 @app.post("/api/volunteers", response_model=Dict)
-async def create_volunteer(volunteer: VolunteerCreate):
+@limiter.limit("60/minute")
+async def create_volunteer(request: Request, volunteer: VolunteerCreate):
     """Create or update a volunteer profile"""
     volunteer_profile = VolunteerProfile(
         user_id=volunteer.user_id,
@@ -257,7 +381,7 @@ async def create_volunteer(volunteer: VolunteerCreate):
         max_distance_km=volunteer.max_distance_km
     )
     
-    volunteers[volunteer.user_id] = volunteer_profile
+    await store.save_volunteer(volunteer_profile)
     
     return {
         "user_id": volunteer.user_id,
@@ -266,50 +390,47 @@ async def create_volunteer(volunteer: VolunteerCreate):
 
 
 @app.get("/api/volunteers/{user_id}")
-async def get_volunteer(user_id: str):
+async def get_volunteer(request: Request, user_id: str):
     """Get a volunteer profile"""
-    if user_id not in volunteers:
+    vol = await store.get_volunteer(user_id)
+    if not vol:
         raise HTTPException(status_code=404, detail="Volunteer not found")
     
-    vol = volunteers[user_id]
-    return {
+    # Profiles can be updated at any time, so clients must revalidate
+    return conditional_json_response(request, {
         "user_id": vol.user_id,
         "skills": vol.skills,
         "interests": vol.interests,
         "availability": vol.availability,
         "preferred_locations": vol.preferred_locations,
         "max_distance_km": vol.max_distance_km
-    }
+    }, cache_control="private, no-cache")
 
 
 @app.post("/api/matches")
-async def find_matches(request: MatchRequest):
+@limiter.limit("10/minute")
+async def find_matches(request: Request, match_request: MatchRequest):
     """Find matching opportunities for a volunteer"""
-    if request.volunteer_id not in volunteers:
+    volunteer = await store.get_volunteer(match_request.volunteer_id)
+    if not volunteer:
         raise HTTPException(status_code=404, detail="Volunteer not found")
     
-    volunteer = volunteers[request.volunteer_id]
-    
     # Convert string confidence to enum
-    confidence_map = {
-        "high": MatchConfidence.HIGH,
-        "medium": MatchConfidence.MEDIUM,
-        "low": MatchConfidence.LOW
-    }
-    min_confidence = confidence_map.get(request.min_confidence, MatchConfidence.LOW)
+    min_confidence = CONFIDENCE_LEVELS.get(match_request.min_confidence, MatchConfidence.LOW)
     
-    # Initialize matcher
-    matcher = OpportunityMatcher()
+    # Only opportunities sharing a skill with the volunteer can reach
+    # high confidence; lower thresholds still need every opportunity
+    if matcher.requires_skill_overlap(min_confidence):
+        opportunities = await store.opportunities_with_skills(matcher.volunteer_skill_keys(volunteer))
+    else:
+        opportunities = await store.all_opportunities()
     
     # Find matches
-    matches = matcher.find_matches(
-        volunteer,
-        list(opportunities.values()),
-        min_confidence
-    )
+    matches = await run_in_threadpool(matcher.find_matches, volunteer, opportunities, min_confidence)
+    candidates = {opp.id: opp for opp in opportunities}
     
-    return {
-        "volunteer_id": request.volunteer_id,
+    return ORJSONResponse({
+        "volunteer_id": match_request.volunteer_id,
         "total_matches": len(matches),
         "matches": [
             {
@@ -318,23 +439,24 @@ async def find_matches(request: MatchRequest):
                 "score": round(match.score, 2),
                 "reason": match.suggested_reason,
                 "opportunity": {
-                    "title": opportunities[match.opportunity_id].title,
-                    "organization": opportunities[match.opportunity_id].organization,
-                    "location": opportunities[match.opportunity_id].location
+                    "title": candidates[match.opportunity_id].title,
+                    "organization": candidates[match.opportunity_id].organization,
+                    "location": candidates[match.opportunity_id].location
                 }
             }
             for match in matches
         ]
-    }
+    })
 
 
 @app.post("/api/conversation/{session_id}/create_opportunity")
-async def create_opportunity_from_conversation(session_id: str):
+@limiter.limit("60/minute")
+async def create_opportunity_from_conversation(
+    request: Request,
+    session: Dict = Depends(require_session)
+):
     """Create an opportunity from conversation data"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    dialog_manager = sessions[session_id]["dialog_manager"]
+    dialog_manager = session["dialog_manager"]
     summary = dialog_manager.get_conversation_summary()
     
     # Check if we have enough information
@@ -346,7 +468,7 @@ async def create_opportunity_from_conversation(session_id: str):
         )
     
     # Create opportunity from gathered info
-    opp_id = f"opp_{uuid.uuid4()}"
+    opp_id = "opp_" + secrets.token_hex(16)
     
     # Build time commitment
     time_commitment = {}
@@ -364,7 +486,8 @@ async def create_opportunity_from_conversation(session_id: str):
         created_at=datetime.now()
     )
     
-    opportunities[opp_id] = new_opportunity
+    await store.add_opportunity(new_opportunity, matcher.skill_index_keys(new_opportunity.skills_needed))
+    await store.clear_cached(OPPORTUNITY_LIST_CACHE)
     
     return {
         "id": opp_id,
@@ -378,12 +501,14 @@ async def create_opportunity_from_conversation(session_id: str):
 
 
 @app.post("/api/conversation/{session_id}/create_volunteer")
-async def create_volunteer_from_conversation(session_id: str, user_id: str):
+@limiter.limit("60/minute")
+async def create_volunteer_from_conversation(
+    request: Request,
+    user_id: str,
+    session: Dict = Depends(require_session)
+):
     """Create a volunteer profile from conversation data"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    dialog_manager = sessions[session_id]["dialog_manager"]
+    dialog_manager = session["dialog_manager"]
     summary = dialog_manager.get_conversation_summary()
     
     # Check if we have enough information
@@ -403,7 +528,7 @@ async def create_volunteer_from_conversation(session_id: str, user_id: str):
         preferred_locations=gathered.get("locations", [])
     )
     
-    volunteers[user_id] = volunteer_profile
+    await store.save_volunteer(volunteer_profile)
     
     return {
         "user_id": user_id,
@@ -420,15 +545,37 @@ async def create_volunteer_from_conversation(session_id: str, user_id: str):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
+    now = time.monotonic()
+    if now < _health["expires"]:
+        return ORJSONResponse(_health["body"])
+    
+    counts = await store.counts()
+    body = {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "sessions_active": len(sessions),
-        "opportunities_count": len(opportunities),
-        "volunteers_count": len(volunteers)
+        "sessions_active": counts["sessions"],
+        "opportunities_count": counts["opportunities"],
+        "volunteers_count": counts["volunteers"]
     }
+    _health["expires"] = now + HEALTH_CACHE_SECONDS
+    _health["body"] = body
+    return ORJSONResponse(body)
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    
+    # Workers are separate processes, so they can only share state through Redis
+    workers = 1
+    if os.environ.get("REDIS_URL"):
+        workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    
+    uvicorn.run(
+        "src.api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        log_level="warning"
+    )
\ No newline at end of file
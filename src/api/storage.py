@@ -0,0 +1,450 @@
+"""
+Storage backends for the CivicForge API
+
+Keeps conversation sessions, opportunities and volunteer profiles.
+InMemoryStore is the development default; RedisStore lets several
+API workers and restarts share the same state.
+"""
+
+import bisect
+import json
+import os
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Protocol, Dict, Iterable, List, Optional, Tuple
+
+from ..core.conversation import DialogManager
+from ..core.conversation.context_tracker import ContextTracker
+from ..core.matching import Opportunity, VolunteerProfile
+from ..core.interfaces import MockLocalController, MockPrivacyManager
+
+
+SESSION_TTL_SECONDS = 3600
+
+# Upper bound on cached entries per namespace in InMemoryStore
+CACHE_MAX_ENTRIES = 1024
+
+
+def opportunity_listing(opp: Opportunity) -> Dict:
+    """Project an opportunity into its entry in the opportunity listing"""
+    return {
+        "id": opp.id,
+        "title": opp.title,
+        "organization": opp.organization,
+        "skills_needed": list(opp.skills_needed),
+        "location": opp.location,
+        "time_commitment": opp.time_commitment,
+        "created_at": opp.created_at.isoformat()
+    }
+
+
+def new_dialog_manager() -> DialogManager:
+    """Create a dialog manager wired with the Phase 1 mock interfaces"""
+    return DialogManager(
+        context_tracker=ContextTracker(),
+        local_controller=MockLocalController(),
+        privacy_manager=MockPrivacyManager()
+    )
+
+
+class APIStore(Protocol):
+    """
+    Protocol for the state behind the API endpoints.
+
+    Sessions are returned as dicts with "id", "dialog_manager" and
+    "created_at" keys. Callers must save a session after changing it.
+    """
+
+    async def get_session(self, session_id: str) -> Optional[Dict]:
+        """Get a session, or None if it does not exist or has expired"""
+        ...
+
+    async def save_session(self, session: Dict) -> None:
+        """Persist a session and refresh its expiry"""
+        ...
+
+    async def add_opportunity(self, opportunity: Opportunity, skill_keys: Iterable[str]) -> None:
+        """Store a new opportunity, indexed under the given skill keys"""
+        ...
+
+    async def get_opportunity(self, opportunity_id: str) -> Optional[Opportunity]:
+        """Get a single opportunity"""
+        ...
+
+    async def list_opportunities(self, offset: int, limit: int) -> Tuple[int, List[Dict]]:
+        """Get the total count and one page of listing entries, newest first"""
+        ...
+
+    async def all_opportunities(self) -> List[Opportunity]:
+        """Get every opportunity, for matching"""
+        ...
+
+    async def opportunities_with_skills(self, skill_keys: Iterable[str]) -> List[Opportunity]:
+        """Get opportunities indexed under any of the skill keys, oldest first"""
+        ...
+
+    async def save_volunteer(self, volunteer: VolunteerProfile) -> None:
+        """Create or replace a volunteer profile"""
+        ...
+
+    async def get_volunteer(self, user_id: str) -> Optional[VolunteerProfile]:
+        """Get a volunteer profile"""
+        ...
+
+    async def counts(self) -> Dict[str, int]:
+        """Get the number of active sessions, opportunities and volunteers"""
+        ...
+
+    async def get_cached(self, namespace: str, key: str) -> Tuple[Optional[Dict], int]:
+        """
+        Get a cached response body (None on a miss) and the namespace's
+        current version, which must be passed back to set_cached().
+        """
+        ...
+
+    async def set_cached(self, namespace: str, key: str, value: Dict, ttl: int, version: int) -> None:
+        """
+        Cache a JSON-serializable response body for up to ttl seconds.
+        Ignored if the namespace was cleared since version was read.
+        """
+        ...
+
+    async def clear_cached(self, namespace: str) -> None:
+        """Invalidate every cached entry in a namespace"""
+        ...
+
+    async def close(self) -> None:
+        """Release any connections held by the store"""
+        ...
+
+
+class InMemoryStore:
+    """
+    Process-local store for development.
+    State is lost on restart and is not shared between workers.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        # session id -> monotonic expiry; re-saving moves a session to the
+        # end, so the dict stays ordered by expiry
+        self._session_expiry = {}
+        self.opportunities = {}
+        self.volunteers = {}
+        # namespace -> {key: (monotonic expiry, version, value)}
+        self._cache = {}
+        self._cache_versions = {}
+
+        # Listing entries are built once, when an opportunity is added
+        self._listings = {}
+
+        # (-created_at timestamp, id) kept sorted so listings are a slice
+        self._newest_first = []
+
+        # Skill key -> opportunity ids, and the keys each opportunity is under
+        self._skill_index = {}
+        self._skill_keys = {}
+
+    async def get_session(self, session_id: str) -> Optional[Dict]:
+        self._prune_sessions()
+        return self.sessions.get(session_id)
+
+    async def save_session(self, session: Dict) -> None:
+        self._prune_sessions()
+        self.sessions[session["id"]] = session
+        self._session_expiry.pop(session["id"], None)
+        self._session_expiry[session["id"]] = time.monotonic() + SESSION_TTL_SECONDS
+
+    def _prune_sessions(self) -> None:
+        """Drop sessions that have not been saved within SESSION_TTL_SECONDS"""
+        now = time.monotonic()
+        while self._session_expiry:
+            session_id, expiry = next(iter(self._session_expiry.items()))
+            if expiry >= now:
+                break
+            del self._session_expiry[session_id]
+            del self.sessions[session_id]
+
+    async def add_opportunity(self, opportunity: Opportunity, skill_keys: Iterable[str]) -> None:
+        previous = self.opportunities.get(opportunity.id)
+        if previous:
+            self._newest_first.remove((-previous.created_at.timestamp(), previous.id))
+            for key in self._skill_keys.pop(previous.id):
+                self._skill_index[key].discard(previous.id)
+
+        self.opportunities[opportunity.id] = opportunity
+        self._listings[opportunity.id] = opportunity_listing(opportunity)
+        bisect.insort(self._newest_first, (-opportunity.created_at.timestamp(), opportunity.id))
+
+        self._skill_keys[opportunity.id] = set(skill_keys)
+        for key in self._skill_keys[opportunity.id]:
+            self._skill_index.setdefault(key, set()).add(opportunity.id)
+
+    async def get_opportunity(self, opportunity_id: str) -> Optional[Opportunity]:
+        return self.opportunities.get(opportunity_id)
+
+    async def list_opportunities(self, offset: int, limit: int) -> Tuple[int, List[Dict]]:
+        page = self._newest_first[offset:offset + limit]
+        return len(self._newest_first), [self._listings[opp_id] for _, opp_id in page]
+
+    async def all_opportunities(self) -> List[Opportunity]:
+        return list(self.opportunities.values())
+
+    async def opportunities_with_skills(self, skill_keys: Iterable[str]) -> List[Opportunity]:
+        opp_ids = set()
+        for key in skill_keys:
+            opp_ids.update(self._skill_index.get(key, ()))
+
+        opportunities = [self.opportunities[opp_id] for opp_id in opp_ids]
+        opportunities.sort(key=lambda opp: (opp.created_at, opp.id))
+        return opportunities
+
+    async def save_volunteer(self, volunteer: VolunteerProfile) -> None:
+        self.volunteers[volunteer.user_id] = volunteer
+
+    async def get_volunteer(self, user_id: str) -> Optional[VolunteerProfile]:
+        return self.volunteers.get(user_id)
+
+    async def counts(self) -> Dict[str, int]:
+        self._prune_sessions()
+        return {
+            "sessions": len(self.sessions),
+            "opportunities": len(self.opportunities),
+            "volunteers": len(self.volunteers)
+        }
+
+    async def get_cached(self, namespace: str, key: str) -> Tuple[Optional[Dict], int]:
+        version = self._cache_versions.get(namespace, 0)
+        entry = self._cache.get(namespace, {}).get(key)
+        if entry is None or entry[0] < time.monotonic() or entry[1] != version:
+            return None, version
+        return entry[2], version
+
+    async def set_cached(self, namespace: str, key: str, value: Dict, ttl: int, version: int) -> None:
+        if version != self._cache_versions.get(namespace, 0):
+            return
+
+        now = time.monotonic()
+        entries = self._cache.setdefault(namespace, {})
+        for expired in [k for k, entry in entries.items() if entry[0] < now]:
+            del entries[expired]
+
+        # Still full: evict the oldest entries (dicts keep insertion order)
+        entries.pop(key, None)
+        while len(entries) >= CACHE_MAX_ENTRIES:
+            del entries[next(iter(entries))]
+
+        entries[key] = (now + ttl, version, value)
+
+    async def clear_cached(self, namespace: str) -> None:
+        self._cache.pop(namespace, None)
+        self._cache_versions[namespace] = self._cache_versions.get(namespace, 0) + 1
+
+    async def close(self) -> None:
+        pass
+
+
+def _opportunity_to_hash(opp: Opportunity) -> Dict[str, str]:
+    """Flatten an opportunity into Redis hash fields"""
+    return {
+        "listing": json.dumps(opportunity_listing(opp)),
+        "id": opp.id,
+        "title": opp.title,
+        "description": opp.description,
+        "organization": opp.organization,
+        "skills_needed": json.dumps(opp.skills_needed),
+        "location": opp.location,
+        "time_commitment": json.dumps(opp.time_commitment),
+        "created_at": opp.created_at.isoformat(),
+        "active": "1" if opp.active else "0",
+        "min_volunteers": str(opp.min_volunteers),
+        "max_volunteers": json.dumps(opp.max_volunteers)
+    }
+
+
+def _opportunity_from_hash(fields: Dict[str, str]) -> Opportunity:
+    """Rebuild an opportunity from Redis hash fields"""
+    return Opportunity(
+        id=fields["id"],
+        title=fields["title"],
+        description=fields["description"],
+        organization=fields["organization"],
+        skills_needed=json.loads(fields["skills_needed"]),
+        location=fields["location"],
+        time_commitment=json.loads(fields["time_commitment"]),
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        active=fields["active"] == "1",
+        min_volunteers=int(fields["min_volunteers"]),
+        max_volunteers=json.loads(fields["max_volunteers"])
+    )
+
+
+class RedisStore:
+    """
+    Redis-backed store shared by all API workers.
+
+    Layout (all keys under the "cf:" prefix):
+    - sess:{id}          JSON session state, expires after SESSION_TTL_SECONDS
+    - sessions:expiry    sorted set of session ids scored by expiry time
+    - opp:{id}           hash of opportunity fields plus its JSON listing entry
+    - opps:by_created    sorted set of opportunity ids scored by created_at
+    - opps:skill:{key}   sorted set of opportunity ids under a skill key, scored by created_at
+    - volunteers         hash of user_id -> JSON profile
+    - cache:{ns}:version         invalidation counter for a cache namespace
+    - cache:{ns}:entry:{key}     JSON {version, value}, expires after its own TTL
+
+    Sessions keep what DialogManager.export_state() covers: dialog state,
+    gathered info, context tracker entities and privacy budgets. Turn
+    history starts empty on each request.
+    """
+
+    PREFIX = "cf:"
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    def _key(self, *parts: str) -> str:
+        return self.PREFIX + ":".join(parts)
+
+    async def get_session(self, session_id: str) -> Optional[Dict]:
+        raw = await self.redis.get(self._key("sess", session_id))
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        dialog_manager = new_dialog_manager()
+        dialog_manager.load_state(data["dialog"])
+        return {
+            "id": data["id"],
+            "dialog_manager": dialog_manager,
+            "created_at": datetime.fromisoformat(data["created_at"])
+        }
+
+    async def save_session(self, session: Dict) -> None:
+        now = time.time()
+        data = {
+            "id": session["id"],
+            "created_at": session["created_at"].isoformat(),
+            "dialog": session["dialog_manager"].export_state()
+        }
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._key("sess", session["id"]), json.dumps(data), ex=SESSION_TTL_SECONDS)
+            pipe.zadd(self._key("sessions", "expiry"), {session["id"]: now + SESSION_TTL_SECONDS})
+            pipe.zremrangebyscore(self._key("sessions", "expiry"), "-inf", now)
+            await pipe.execute()
+
+    async def add_opportunity(self, opportunity: Opportunity, skill_keys: Iterable[str]) -> None:
+        created = {opportunity.id: opportunity.created_at.timestamp()}
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key("opp", opportunity.id), mapping=_opportunity_to_hash(opportunity))
+            pipe.zadd(self._key("opps", "by_created"), created)
+            for key in set(skill_keys):
+                pipe.zadd(self._key("opps", "skill", key), created)
+            await pipe.execute()
+
+    async def get_opportunity(self, opportunity_id: str) -> Optional[Opportunity]:
+        fields = await self.redis.hgetall(self._key("opp", opportunity_id))
+        return _opportunity_from_hash(fields) if fields else None
+
+    async def _get_opportunities(self, opportunity_ids: List[str]) -> List[Opportunity]:
+        """Fetch several opportunities in one round trip, skipping missing ones"""
+        if not opportunity_ids:
+            return []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for opp_id in opportunity_ids:
+                pipe.hgetall(self._key("opp", opp_id))
+            results = await pipe.execute()
+
+        return [_opportunity_from_hash(fields) for fields in results if fields]
+
+    async def list_opportunities(self, offset: int, limit: int) -> Tuple[int, List[Dict]]:
+        if limit <= 0:
+            # ZREVRANGE treats a stop index of -1 as "to the end"
+            return await self.redis.zcard(self._key("opps", "by_created")), []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._key("opps", "by_created"))
+            pipe.zrevrange(self._key("opps", "by_created"), offset, offset + limit - 1)
+            total, page_ids = await pipe.execute()
+
+        if not page_ids:
+            return total, []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for opp_id in page_ids:
+                pipe.hget(self._key("opp", opp_id), "listing")
+            listings = await pipe.execute()
+
+        return total, [json.loads(listing) for listing in listings if listing is not None]
+
+    async def all_opportunities(self) -> List[Opportunity]:
+        opp_ids = await self.redis.zrange(self._key("opps", "by_created"), 0, -1)
+        return await self._get_opportunities(opp_ids)
+
+    async def opportunities_with_skills(self, skill_keys: Iterable[str]) -> List[Opportunity]:
+        keys = [self._key("opps", "skill", key) for key in skill_keys]
+        if not keys:
+            return []
+
+        # Every index scores an id by the same created_at, so MIN keeps it as is
+        opp_ids = await self.redis.zunion(keys, aggregate="MIN")
+        return await self._get_opportunities(opp_ids)
+
+    async def save_volunteer(self, volunteer: VolunteerProfile) -> None:
+        await self.redis.hset(self._key("volunteers"), volunteer.user_id, json.dumps(asdict(volunteer)))
+
+    async def get_volunteer(self, user_id: str) -> Optional[VolunteerProfile]:
+        raw = await self.redis.hget(self._key("volunteers"), user_id)
+        return VolunteerProfile(**json.loads(raw)) if raw is not None else None
+
+    async def counts(self) -> Dict[str, int]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcount(self._key("sessions", "expiry"), time.time(), "+inf")
+            pipe.zcard(self._key("opps", "by_created"))
+            pipe.hlen(self._key("volunteers"))
+            sessions, opportunities, volunteers = await pipe.execute()
+
+        return {
+            "sessions": sessions,
+            "opportunities": opportunities,
+            "volunteers": volunteers
+        }
+
+    async def get_cached(self, namespace: str, key: str) -> Tuple[Optional[Dict], int]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self._key("cache", namespace, "version"))
+            pipe.get(self._key("cache", namespace, "entry", key))
+            version, raw = await pipe.execute()
+
+        version = int(version or 0)
+        if raw is None:
+            return None, version
+
+        # Entries written before the last invalidation are left to expire
+        entry = json.loads(raw)
+        return (entry["value"] if entry["version"] == version else None), version
+
+    async def set_cached(self, namespace: str, key: str, value: Dict, ttl: int, version: int) -> None:
+        entry = json.dumps({"version": version, "value": value})
+        await self.redis.set(self._key("cache", namespace, "entry", key), entry, ex=ttl)
+
+    async def clear_cached(self, namespace: str) -> None:
+        await self.redis.incr(self._key("cache", namespace, "version"))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_store() -> APIStore:
+    """Create the store selected by the REDIS_URL environment variable"""
+    redis_url = os.environ.get("REDIS_URL")
+    if not redis_url:
+        return InMemoryStore()
+
+    # Only needed when Redis is configured
+    import redis.asyncio
+
+    return RedisStore(redis.asyncio.Redis.from_url(redis_url, decode_responses=True))
@@ -0,0 +1,180 @@
+"""
+Tests for the API endpoints
+
+Each test gets a fresh store; every test runs against both backends.
+"""
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from .. import main
+from ..storage import InMemoryStore, RedisStore
+
+
+@pytest.fixture(params=["memory", "redis"])
+def client(request, monkeypatch):
+    """Create a test client backed by an empty store"""
+    if request.param == "memory":
+        store = InMemoryStore()
+    else:
+        store = RedisStore(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    
+    monkeypatch.setattr(main, "store", store)
+    monkeypatch.setitem(main._health, "expires", 0.0)
+    main.limiter.reset()
+    
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def create_opportunity(client, title: str, skills=None) -> str:
+    """Create an opportunity through the API and return its id"""
+    response = client.post("/api/opportunities", json={
+        "title": title,
+        "description": "Help teach kids",
+        "organization": "Code Club",
+        "skills_needed": skills or [],
+        "location": "Downtown Library",
+        "time_commitment": {"day": "saturday", "period": "morning"}
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def create_volunteer(client, user_id: str = "v1"):
+    """Create a volunteer who teaches on Saturday mornings downtown"""
+    response = client.post("/api/volunteers", json={
+        "user_id": user_id,
+        "skills": ["teaching"],
+        "interests": ["kids"],
+        "availability": [{"day": "saturday", "period": "morning"}],
+        "preferred_locations": ["Downtown"]
+    })
+    assert response.status_code == 200
+
+
+def test_conversation_session_lifecycle(client):
+    """Test a conversation keeps its session across turns and can be reset"""
+    response = client.post("/api/conversation", json={"message": "I want to help teach programming"})
+    assert response.status_code == 200
+    session_id = response.json()["session_id"]
+    
+    response = client.post("/api/conversation", json={
+        "message": "Saturday mornings downtown",
+        "session_id": session_id
+    })
+    assert response.json()["session_id"] == session_id
+    
+    # Times gathered on the first turn are still there on the second
+    assert response.json()["gathered_info"]["times"] == [
+        {"day": "any", "period": "morning"},
+        {"day": "saturday", "period": "morning"}
+    ]
+    
+    summary = client.get(f"/api/conversation/{session_id}/summary").json()
+    assert summary["gathered_info"]["intent"] == "OFFER_HELP"
+    
+    assert client.post(f"/api/conversation/{session_id}/reset").status_code == 200
+    summary = client.get(f"/api/conversation/{session_id}/summary").json()
+    assert summary["state"] == "greeting"
+    assert summary["gathered_info"]["times"] == []
+
+
+def test_unknown_session_returns_404(client):
+    """Test endpoints that need a session reject unknown ids"""
+    assert client.get("/api/conversation/missing/summary").status_code == 404
+    assert client.post("/api/conversation/missing/reset").status_code == 404
+    assert client.post("/api/conversation/missing/create_opportunity").status_code == 404
+    assert client.post(
+        "/api/conversation/missing/create_volunteer", params={"user_id": "v1"}
+    ).status_code == 404
+
+
+def test_list_opportunities_pagination(client):
+    """Test listings are newest first and page bounds are validated"""
+    for i in range(3):
+        create_opportunity(client, f"Opportunity {i}")
+    
+    body = client.get("/api/opportunities", params={"limit": 2, "offset": 1}).json()
+    assert body["total"] == 3
+    assert [opp["title"] for opp in body["opportunities"]] == ["Opportunity 1", "Opportunity 0"]
+    
+    for params in [{"limit": 0}, {"limit": 101}, {"offset": -1}]:
+        assert client.get("/api/opportunities", params=params).status_code == 422
+
+
+def test_listing_cache_invalidated_on_create(client):
+    """Test a cached listing page reflects an opportunity created after it"""
+    create_opportunity(client, "First")
+    assert client.get("/api/opportunities").json()["total"] == 1
+    
+    create_opportunity(client, "Second")
+    body = client.get("/api/opportunities").json()
+    assert body["total"] == 2
+    assert body["opportunities"][0]["title"] == "Second"
+
+
+def test_get_opportunity_with_etag(client):
+    """Test opportunity lookups support If-None-Match revalidation"""
+    opp_id = create_opportunity(client, "Tutor", skills=["teaching"])
+    
+    response = client.get(f"/api/opportunities/{opp_id}")
+    assert response.status_code == 200
+    assert response.json()["skills_needed"] == ["teaching"]
+    
+    etag = response.headers["etag"]
+    assert etag == f'"{opp_id}"'
+    response = client.get(f"/api/opportunities/{opp_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    assert client.get("/api/opportunities/missing").status_code == 404
+
+
+def test_volunteer_etag_changes_on_update(client):
+    """Test an updated volunteer profile no longer matches the old ETag"""
+    create_volunteer(client)
+    etag = client.get("/api/volunteers/v1").headers["etag"]
+    
+    client.post("/api/volunteers", json={
+        "user_id": "v1",
+        "skills": ["gardening"],
+        "interests": [],
+        "availability": [],
+        "preferred_locations": []
+    })
+    response = client.get("/api/volunteers/v1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["skills"] == ["gardening"]
+    
+    assert client.get("/api/volunteers/missing").status_code == 404
+
+
+def test_high_confidence_matches_use_skill_index(client):
+    """Test high confidence matches equal the high matches of a full scan"""
+    create_opportunity(client, "Tutor", skills=["teaching"])
+    create_opportunity(client, "Mentor", skills=["mentoring"])
+    create_opportunity(client, "Gardener", skills=["gardening"])
+    create_opportunity(client, "Greeter")
+    create_volunteer(client)
+    
+    low = client.post("/api/matches", json={"volunteer_id": "v1", "min_confidence": "low"}).json()
+    high = client.post("/api/matches", json={"volunteer_id": "v1", "min_confidence": "high"}).json()
+    
+    high_from_scan = [match for match in low["matches"] if match["confidence"] == "high"]
+    assert high["matches"] == high_from_scan
+    assert {match["opportunity"]["title"] for match in high["matches"]} == {"Tutor", "Mentor", "Greeter"}
+    
+    assert client.post("/api/matches", json={"volunteer_id": "missing"}).status_code == 404
+
+
+def test_health_counts(client):
+    """Test the health check reports store counts"""
+    create_opportunity(client, "Tutor")
+    create_volunteer(client)
+    
+    body = client.get("/health").json()
+    assert body["status"] == "healthy"
+    assert body["opportunities_count"] == 1
+    assert body["volunteers_count"] == 1
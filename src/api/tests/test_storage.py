@@ -0,0 +1,241 @@
+"""
+Tests for the API storage backends
+
+Every test runs against both InMemoryStore and RedisStore (on fakeredis).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from ...core.matching import Opportunity, VolunteerProfile
+from .. import storage
+from ..storage import (
+    InMemoryStore,
+    RedisStore,
+    SESSION_TTL_SECONDS,
+    new_dialog_manager
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    """Create an empty store for each backend"""
+    if request.param == "memory":
+        return InMemoryStore()
+    return RedisStore(fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+
+def make_opportunity(opp_id: str, minutes_ago: int, skills=None) -> Opportunity:
+    """Create an opportunity created the given number of minutes ago"""
+    return Opportunity(
+        id=opp_id,
+        title=f"Opportunity {opp_id}",
+        description="Help out",
+        organization="Community",
+        skills_needed=skills or [],
+        location="Downtown",
+        time_commitment={"day": "saturday", "period": "morning"},
+        created_at=datetime(2024, 1, 1, 12, 0) - timedelta(minutes=minutes_ago)
+    )
+
+
+async def add_opportunities(store, count: int):
+    """Add opportunities opp0 (oldest) to opp{count-1} (newest)"""
+    for i in range(count):
+        await store.add_opportunity(make_opportunity(f"opp{i}", count - i), [])
+
+
+@pytest.mark.asyncio
+async def test_list_opportunities_newest_first(store):
+    """Test listings are paginated newest first"""
+    await add_opportunities(store, 5)
+    
+    total, page = await store.list_opportunities(0, 2)
+    assert total == 5
+    assert [entry["id"] for entry in page] == ["opp4", "opp3"]
+    
+    total, page = await store.list_opportunities(4, 2)
+    assert [entry["id"] for entry in page] == ["opp0"]
+    
+    total, page = await store.list_opportunities(10, 2)
+    assert total == 5
+    assert page == []
+
+
+@pytest.mark.asyncio
+async def test_list_opportunities_zero_limit(store):
+    """Test a zero limit returns an empty page rather than everything"""
+    await add_opportunities(store, 3)
+    
+    total, page = await store.list_opportunities(0, 0)
+    assert total == 3
+    assert page == []
+
+
+@pytest.mark.asyncio
+async def test_listing_entry_fields(store):
+    """Test listing entries carry the public opportunity fields"""
+    opp = make_opportunity("opp1", 0, skills=["teaching"])
+    await store.add_opportunity(opp, [])
+    
+    _, page = await store.list_opportunities(0, 1)
+    assert page == [{
+        "id": "opp1",
+        "title": opp.title,
+        "organization": opp.organization,
+        "skills_needed": ["teaching"],
+        "location": opp.location,
+        "time_commitment": opp.time_commitment,
+        "created_at": opp.created_at.isoformat()
+    }]
+
+
+@pytest.mark.asyncio
+async def test_get_and_all_opportunities(store):
+    """Test opportunities round-trip through the store"""
+    opp = make_opportunity("opp1", 0, skills=["teaching"])
+    await store.add_opportunity(opp, [])
+    
+    assert await store.get_opportunity("opp1") == opp
+    assert await store.get_opportunity("missing") is None
+    assert await store.all_opportunities() == [opp]
+
+
+@pytest.mark.asyncio
+async def test_opportunities_with_skills(store):
+    """Test the skill index returns each matching opportunity once, oldest first"""
+    await store.add_opportunity(make_opportunity("teach", 3), ["skill:teaching", "group:teaching"])
+    await store.add_opportunity(make_opportunity("garden", 2), ["skill:gardening"])
+    await store.add_opportunity(make_opportunity("any", 1), ["*"])
+    await store.add_opportunity(make_opportunity("tutor", 0), ["skill:tutoring", "group:teaching"])
+    
+    found = await store.opportunities_with_skills(["*", "skill:teaching", "group:teaching"])
+    assert [opp.id for opp in found] == ["teach", "any", "tutor"]
+    
+    assert await store.opportunities_with_skills(["skill:cooking"]) == []
+    assert await store.opportunities_with_skills([]) == []
+
+
+@pytest.mark.asyncio
+async def test_session_save_and_load(store):
+    """Test a session keeps its dialog state between requests"""
+    dialog_manager = new_dialog_manager()
+    dialog_manager.process_turn("I want to help teach programming")
+    session = {
+        "id": "sess1",
+        "dialog_manager": dialog_manager,
+        "created_at": datetime(2024, 1, 1, 12, 0)
+    }
+    await store.save_session(session)
+    
+    loaded = await store.get_session("sess1")
+    assert loaded["id"] == "sess1"
+    assert loaded["created_at"] == session["created_at"]
+    assert loaded["dialog_manager"].export_state() == dialog_manager.export_state()
+    assert await store.get_session("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_volunteers_and_counts(store):
+    """Test volunteer profiles round-trip and are counted"""
+    volunteer = VolunteerProfile(
+        user_id="v1",
+        skills=["teaching"],
+        interests=[],
+        availability=[{"day": "saturday", "period": "morning"}],
+        preferred_locations=["downtown"]
+    )
+    await store.save_volunteer(volunteer)
+    await store.add_opportunity(make_opportunity("opp1", 0), [])
+    
+    assert await store.get_volunteer("v1") == volunteer
+    assert await store.get_volunteer("missing") is None
+    assert await store.counts() == {"sessions": 0, "opportunities": 1, "volunteers": 1}
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidation(store):
+    """Test clearing a namespace invalidates its entries"""
+    value, version = await store.get_cached("ns", "key")
+    assert value is None
+    
+    await store.set_cached("ns", "key", {"a": 1}, 30, version)
+    assert (await store.get_cached("ns", "key"))[0] == {"a": 1}
+    
+    await store.clear_cached("ns")
+    assert (await store.get_cached("ns", "key"))[0] is None
+
+
+@pytest.mark.asyncio
+async def test_cache_ignores_writes_computed_before_invalidation(store):
+    """Test a value computed before a clear is not served after it"""
+    _, version = await store.get_cached("ns", "key")
+    await store.clear_cached("ns")
+    await store.set_cached("ns", "key", {"stale": True}, 30, version)
+    
+    assert (await store.get_cached("ns", "key"))[0] is None
+
+
+@pytest.mark.asyncio
+async def test_cache_entries_expire_individually(store):
+    """Test each entry expires after its own TTL even while others are written"""
+    _, version = await store.get_cached("ns", "short")
+    await store.set_cached("ns", "short", {"a": 1}, 1, version)
+    await asyncio.sleep(0.6)
+    await store.set_cached("ns", "long", {"b": 2}, 30, version)
+    await asyncio.sleep(0.6)
+    
+    assert (await store.get_cached("ns", "short"))[0] is None
+    assert (await store.get_cached("ns", "long"))[0] == {"b": 2}
+
+
+@pytest.mark.asyncio
+async def test_redis_sessions_expire():
+    """Test Redis session keys carry the session TTL"""
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    store = RedisStore(redis)
+    await store.save_session({
+        "id": "sess1",
+        "dialog_manager": new_dialog_manager(),
+        "created_at": datetime.now()
+    })
+    
+    assert 0 < await redis.ttl("cf:sess:sess1") <= SESSION_TTL_SECONDS
+    assert (await store.counts())["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_in_memory_sessions_expire(monkeypatch):
+    """Test in-memory sessions expire once they go unsaved for the TTL"""
+    monkeypatch.setattr(storage, "SESSION_TTL_SECONDS", 0.5)
+    store = InMemoryStore()
+    for session_id in ["old", "active"]:
+        await store.save_session({
+            "id": session_id,
+            "dialog_manager": new_dialog_manager(),
+            "created_at": datetime.now()
+        })
+    
+    await asyncio.sleep(0.3)
+    await store.save_session(await store.get_session("active"))
+    await asyncio.sleep(0.3)
+    
+    assert await store.get_session("old") is None
+    assert (await store.get_session("active"))["id"] == "active"
+    assert (await store.counts())["sessions"] == 1
+
+
+def test_in_memory_cache_is_bounded(monkeypatch):
+    """Test the in-memory cache evicts the oldest entries once full"""
+    monkeypatch.setattr(storage, "CACHE_MAX_ENTRIES", 2)
+    store = InMemoryStore()
+    
+    async def fill():
+        for key in ["a", "b", "c"]:
+            await store.set_cached("ns", key, {"key": key}, 30, 0)
+        return [(await store.get_cached("ns", key))[0] for key in ["a", "b", "c"]]
+    
+    assert asyncio.run(fill()) == [None, {"key": "b"}, {"key": "c"}]
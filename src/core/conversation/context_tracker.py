@@ -5,6 +5,7 @@ Tracks conversation context and history to improve intent recognition
 and maintain conversational coherence.
 """
 
+import copy
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -170,6 +171,22 @@ class ContextTracker:
     def reset(self):
         """Reset the context tracker"""
         self.context = ConversationContext()
+    
+    def export_state(self) -> Dict:
+        """Export context as plain data (turn history is not included)"""
+        return {
+            "current_topic": self.context.current_topic,
+            "established_intent": self.context.established_intent,
+            "mentioned_entities": copy.deepcopy(self.context.mentioned_entities)
+        }
+    
+    def load_state(self, state: Dict):
+        """Restore context produced by export_state() with an empty turn history"""
+        self.context = ConversationContext(
+            current_topic=state["current_topic"],
+            established_intent=state["established_intent"],
+            mentioned_entities=copy.deepcopy(state["mentioned_entities"])
+        )
         
     def should_ask_clarification(self) -> Tuple[bool, Optional[str]]:
         """Determine if we should ask for clarification based on context"""
@@ -5,6 +5,7 @@ Manages conversation flow, generates appropriate responses,
 and guides users through civic engagement interactions.
 """
 
+import copy
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
@@ -298,7 +299,31 @@ class DialogManager:
             "confirmed": self.gathered_info.get("confirmed", False),
             "tracker_summary": tracker_summary
         }
-    
+
+    def export_state(self) -> Dict:
+        """
+        Export dialog state as plain data: the dialog state, gathered info,
+        context tracker entities and privacy budgets. Turn history and the
+        intent recognizer's short-answer context are not included.
+        """
+        return {
+            "state": self.current_state.value,
+            "gathered_info": copy.deepcopy(self.gathered_info),
+            "context": self.context_tracker.export_state(),
+            "privacy_budgets": self.privacy_manager.export_budgets()
+        }
+
+    def load_state(self, state: Dict):
+        """Restore dialog state produced by export_state()"""
+        self.current_state = ConversationState(state["state"])
+        self.gathered_info = copy.deepcopy(state["gathered_info"])
+        
+        # Sessions saved before context and budgets were exported lack these keys
+        if "context" in state:
+            self.context_tracker.load_state(state["context"])
+        if "privacy_budgets" in state:
+            self.privacy_manager.load_budgets(state["privacy_budgets"])
+
     def _update_gathered_info(self, nlp_result: NLPResult):
         """Update gathered information from NLP results"""
         if nlp_result.intent.intent != "UNCLEAR":
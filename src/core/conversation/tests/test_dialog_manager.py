@@ -252,4 +252,44 @@ def test_confirmation_ambiguous_response(dialog_manager):
     response = dialog_manager.process_turn("I'm not sure")
     
     assert dialog_manager.current_state == ConversationState.CONFIRMING
-    assert "yes or no" in response.lower()
\ No newline at end of file
+    assert "yes or no" in response.lower()
+
+
+def test_export_and_load_state(dialog_manager):
+    """Test dialog state round-trips through plain data"""
+    dialog_manager.process_turn("I want to help teach programming")
+    state = dialog_manager.export_state()
+    
+    restored = DialogManager()
+    restored.load_state(state)
+    
+    assert restored.current_state == dialog_manager.current_state
+    assert restored.gathered_info == dialog_manager.gathered_info
+    
+    # Restored state must not alias the exported data
+    state["gathered_info"]["skills"].append("cooking")
+    assert "cooking" not in restored.gathered_info["skills"]
+
+
+def test_export_and_load_state_keeps_context_and_privacy_budget(dialog_manager):
+    """Test context entities and privacy budget survive a state round-trip"""
+    dialog_manager.process_turn("I want to help teach programming")
+    dialog_manager.process_turn("Saturday mornings at the library")
+    state = dialog_manager.export_state()
+    
+    restored = DialogManager()
+    restored.load_state(state)
+    
+    original_budget = dialog_manager.privacy_manager.check_privacy_budget("anonymous")
+    restored_budget = restored.privacy_manager.check_privacy_budget("anonymous")
+    assert restored_budget.queries_used == original_budget.queries_used == 2
+    assert restored_budget.total_queries == original_budget.total_queries
+    
+    original_context = dialog_manager.context_tracker.get_context_summary()
+    restored_context = restored.context_tracker.get_context_summary()
+    assert restored_context["established_intent"] == original_context["established_intent"]
+    assert restored_context["mentioned_entities"] == original_context["mentioned_entities"]
+    
+    # The budget keeps counting from the restored value
+    restored.process_turn("yes")
+    assert restored.privacy_manager.check_privacy_budget("anonymous").queries_used == 3
@@ -59,6 +59,14 @@ class PrivacyManager(Protocol):
     def get_shareable_profile(self, user_id: str, purpose: str) -> Dict[str, Any]:
         """Get user profile data that can be shared for given purpose"""
         ...
+    
+    def export_budgets(self) -> Dict[str, Dict[str, Any]]:
+        """Export every user's privacy budget as plain data"""
+        ...
+    
+    def load_budgets(self, budgets: Dict[str, Dict[str, Any]]):
+        """Restore privacy budgets produced by export_budgets()"""
+        ...
 
 
 class MockPrivacyManager:
@@ -67,15 +75,24 @@ class MockPrivacyManager:
     Always permits operations but logs them for future implementation.
     """
     
-    def __init__(self):
+    def __init__(self, max_users: Optional[int] = None):
+        # With max_users set, the least recently checked budgets are dropped
+        self.max_users = max_users
         self._budgets = {}
         self._log = []
     
     def check_privacy_budget(self, user_id: str) -> PrivacyBudget:
         """Check remaining privacy budget for a user"""
-        if user_id not in self._budgets:
-            self._budgets[user_id] = PrivacyBudget()
-        return self._budgets[user_id]
+        budget = self._budgets.pop(user_id, None)
+        if budget is None:
+            budget = PrivacyBudget()
+            if self.max_users is not None:
+                while len(self._budgets) >= self.max_users:
+                    del self._budgets[next(iter(self._budgets))]
+        
+        # Re-insert so dict order runs from least to most recently checked
+        self._budgets[user_id] = budget
+        return budget
     
     def filter_sensitive_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """For now, return data as-is but log the operation"""
@@ -100,4 +117,26 @@ class MockPrivacyManager:
             "user_id": f"anon_{hash(user_id) % 10000}",
             "interests": [],  # Would come from consent
             "availability": []  # Would come from consent
+        }
+    
+    def export_budgets(self) -> Dict[str, Dict[str, Any]]:
+        """Export every user's privacy budget as plain data"""
+        return {
+            user_id: {
+                "total_queries": budget.total_queries,
+                "queries_used": budget.queries_used,
+                "reset_date": budget.reset_date.isoformat() if budget.reset_date else None
+            }
+            for user_id, budget in self._budgets.items()
+        }
+    
+    def load_budgets(self, budgets: Dict[str, Dict[str, Any]]):
+        """Restore privacy budgets produced by export_budgets()"""
+        self._budgets = {
+            user_id: PrivacyBudget(
+                total_queries=data["total_queries"],
+                queries_used=data["queries_used"],
+                reset_date=datetime.fromisoformat(data["reset_date"]) if data["reset_date"] else None
+            )
+            for user_id, data in budgets.items()
         }
\ No newline at end of file
@@ -6,7 +6,7 @@ skills, availability, location, and preferences.
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -63,6 +63,12 @@ class Match:
 class OpportunityMatcher:
     """Matches volunteers with opportunities"""
     
+    # Index key for opportunities that need no particular skill
+    ANY_SKILL = "*"
+    
+    # Share of the match score that comes from skill matching
+    SKILL_WEIGHT = 0.4
+    
     def __init__(self, privacy_manager: PrivacyManager = None):
         self.privacy_manager = privacy_manager or MockPrivacyManager()
         
@@ -151,7 +157,7 @@ class OpportunityMatcher:
         
         # Calculate weighted total
         total_score = (
-            skill_score * 0.4 +
+            skill_score * self.SKILL_WEIGHT +
             availability_score * 0.3 +
             location_score * 0.2 +
             interest_score * 0.1
@@ -189,6 +195,43 @@ class OpportunityMatcher:
         
         return min(matched_skills / len(needed_skills), 1.0)
     
+    def skill_index_keys(self, skills_needed: List[str]) -> Set[str]:
+        """Get the index keys an opportunity needing these skills is filed under"""
+        if not skills_needed:
+            return {self.ANY_SKILL}
+        
+        keys = set()
+        for needed in (s.lower() for s in skills_needed):
+            keys.add(f"skill:{needed}")
+            
+            # Mirrors _calculate_skill_match, which only checks the first synonym group
+            for skill, synonyms in self.skill_synonyms.items():
+                if needed in [skill] + synonyms:
+                    keys.add(f"group:{skill}")
+                    break
+        
+        return keys
+    
+    def volunteer_skill_keys(self, volunteer: VolunteerProfile) -> Set[str]:
+        """
+        Get the index keys of every opportunity the volunteer has a non-zero
+        skill score with. Opportunities filed under none of these keys score 0.
+        """
+        keys = {self.ANY_SKILL}
+        for v_skill in (s.lower() for s in volunteer.skills + volunteer.interests):
+            keys.add(f"skill:{v_skill}")
+            
+            for skill, synonyms in self.skill_synonyms.items():
+                if v_skill in [skill] + synonyms:
+                    keys.add(f"group:{skill}")
+        
+        return keys
+    
+    def requires_skill_overlap(self, min_confidence: MatchConfidence) -> bool:
+        """Check whether matches at this confidence need a non-zero skill score"""
+        best_without_skills = self._score_to_confidence(1.0 - self.SKILL_WEIGHT)
+        return self._confidence_value(best_without_skills) < self._confidence_value(min_confidence)
+    
     def _calculate_availability_match(self, 
                                     volunteer_times: List[Dict[str, str]], 
                                     opportunity_time: Dict[str, str]) -> float:
@@ -4,6 +4,7 @@ Tests for Opportunity Matcher
 
 import pytest
 from datetime import datetime
+from ...interfaces import MockPrivacyManager
 from ..opportunity_matcher import (
     OpportunityMatcher,
     Opportunity,
@@ -294,4 +295,52 @@ def test_inactive_opportunities_filtered(matcher, sample_volunteer):
     ]
     
     matches = matcher.find_matches(sample_volunteer, opportunities)
-    assert len(matches) == 0
\ No newline at end of file
+    assert len(matches) == 0
+
+
+def test_skill_index_keys_cover_skill_matches(matcher, sample_opportunities):
+    """Test that any opportunity with a skill match shares an index key with the volunteer"""
+    volunteers = [
+        VolunteerProfile("v1", ["Teaching"], [], [], []),
+        VolunteerProfile("v2", ["tutoring"], [], [], []),
+        VolunteerProfile("v3", [], ["landscaping"], [], []),
+        VolunteerProfile("v4", ["cooking"], [], [], []),
+        VolunteerProfile("v5", [], [], [], [])
+    ]
+    no_skills = Opportunity(
+        id="opp4",
+        title="Greeter",
+        description="Welcome visitors",
+        organization="Museum",
+        skills_needed=[],
+        location="Museum",
+        time_commitment={},
+        created_at=datetime.now()
+    )
+    
+    for volunteer in volunteers:
+        volunteer_keys = matcher.volunteer_skill_keys(volunteer)
+        for opp in sample_opportunities + [no_skills]:
+            indexed = bool(volunteer_keys & matcher.skill_index_keys(opp.skills_needed))
+            skill_score = matcher._calculate_skill_match(
+                volunteer.skills + volunteer.interests, opp.skills_needed
+            )
+            assert indexed == (skill_score > 0)
+
+
+def test_requires_skill_overlap(matcher):
+    """Test that only high confidence matches can skip opportunities without a skill match"""
+    assert matcher.requires_skill_overlap(MatchConfidence.HIGH)
+    assert not matcher.requires_skill_overlap(MatchConfidence.MEDIUM)
+    assert not matcher.requires_skill_overlap(MatchConfidence.LOW)
+
+
+def test_shared_matcher_privacy_budgets_are_bounded(sample_opportunities, sample_volunteer):
+    """Test that a long-lived matcher keeps budgets for at most max_users volunteers"""
+    matcher = OpportunityMatcher(privacy_manager=MockPrivacyManager(max_users=2))
+    
+    for user_id in ["v1", "v2", "v3"]:
+        sample_volunteer.user_id = user_id
+        matcher.find_matches(sample_volunteer, sample_opportunities)
+    
+    assert list(matcher.privacy_manager.export_budgets()) == ["v2", "v3"]
@@ -7,6 +7,7 @@ providing foundation for future LLM integration.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 import numpy as np
 from sentence_transformers import SentenceTransformer
@@ -22,12 +23,24 @@ class IntentResult:
     method: str = "embedding"  # Track if we used embedding or fallback
 
 
+@lru_cache(maxsize=None)
+def load_model(model_name: str) -> SentenceTransformer:
+    """Load a sentence transformer once per process; recognizers share it"""
+    return SentenceTransformer(model_name)
+
+
+@lru_cache(maxsize=None)
+def _encode_exemplars(model_name: str, phrases: Tuple[str, ...]) -> np.ndarray:
+    """Encode exemplar phrases once per model (treat the result as read-only)"""
+    return load_model(model_name).encode(list(phrases))
+
+
 class EmbeddingIntentRecognizer:
     """Recognizes user intent using semantic embeddings"""
 
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        # Load pre-trained sentence transformer
-        self.model = SentenceTransformer(model_name)
+        # Load pre-trained sentence transformer (shared by every recognizer)
+        self.model = load_model(model_name)
         
         # Intent exemplars - representative phrases for each intent
         self.intent_exemplars = {
@@ -76,8 +89,7 @@ class EmbeddingIntentRecognizer:
         # Pre-compute embeddings for all exemplars
         self.intent_embeddings = {}
         for intent, phrases in self.intent_exemplars.items():
-            embeddings = self.model.encode(phrases)
-            self.intent_embeddings[intent] = embeddings
+            self.intent_embeddings[intent] = _encode_exemplars(model_name, tuple(phrases))
             
         # Context tracking
         self.context = {}
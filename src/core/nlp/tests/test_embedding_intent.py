@@ -100,6 +100,22 @@ class TestEmbeddingIntentRecognition:
         # Since we don't have the actual model, we can't test the exact behavior
         # but we can verify the method exists and doesn't crash
         assert hasattr(recognizer, "add_training_phrases")
+    
+    def test_model_shared_between_recognizers(self):
+        """Test that the model and exemplar embeddings are loaded once per process"""
+        first = EmbeddingIntentRecognizer()
+        second = EmbeddingIntentRecognizer()
+        
+        assert first.model is second.model
+        shared_embeddings = second.intent_embeddings["OFFER_HELP"]
+        shared_shape = shared_embeddings.shape
+        assert first.intent_embeddings["OFFER_HELP"] is shared_embeddings
+        
+        # Training one recognizer must not touch the cached embeddings the other uses
+        first.add_training_phrases("OFFER_HELP", ["Count me in"])
+        assert second.intent_embeddings["OFFER_HELP"] is shared_embeddings
+        assert shared_embeddings.shape == shared_shape
+        assert first.intent_embeddings["OFFER_HELP"].shape[0] == shared_shape[0] + 1
 
 
 class TestBackwardCompatibility:
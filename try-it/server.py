@@ -65,6 +65,25 @@ MOCK_OPPORTUNITIES = [
     }
 ]
 
+# Keyword lists for intent detection, checked in priority order
+INTENT_KEYWORDS = [
+    (("help", "volunteer", "contribute", "assist"), "seeking_opportunities"),
+    (("free", "available", "time", "hours"), "has_availability"),
+    (("teach", "mentor", "guide"), "wants_to_teach"),
+    (("environment", "nature", "clean"), "environmental_interest"),
+]
+
+# Lookup indexes over the mock data, built once at startup
+OPPORTUNITIES_BY_ID = {opp["id"]: opp for opp in MOCK_OPPORTUNITIES}
+OPPORTUNITIES_BY_CATEGORY: Dict[str, List[Dict[str, Any]]] = {}
+OPPORTUNITIES_BY_SKILL: Dict[str, List[Dict[str, Any]]] = {}
+for _opp in MOCK_OPPORTUNITIES:
+    OPPORTUNITIES_BY_CATEGORY.setdefault(_opp["category"], []).append(_opp)
+    for _skill in _opp.get("skills", []):
+        OPPORTUNITIES_BY_SKILL.setdefault(_skill, []).append(_opp)
+SENIOR_OPPORTUNITIES = [opp for opp in MOCK_OPPORTUNITIES
+                        if "senior" in opp["title"].lower()]
+
 class CivicQuery(BaseModel):
     """Natural language query from the Local Controller"""
     text: str
@@ -97,29 +116,21 @@ async def think(query: CivicQuery):
     text_lower = query.text.lower()
     
     # Determine intent based on keywords (simplified for prototype)
-    if any(word in text_lower for word in ["help", "volunteer", "contribute", "assist"]):
-        intent = "seeking_opportunities"
-    elif any(word in text_lower for word in ["free", "available", "time", "hours"]):
-        intent = "has_availability"
-    elif any(word in text_lower for word in ["teach", "mentor", "guide"]):
-        intent = "wants_to_teach"
-    elif any(word in text_lower for word in ["environment", "nature", "clean"]):
-        intent = "environmental_interest"
-    else:
-        intent = "general_civic_interest"
-    
+    intent = next(
+        (name for words, name in INTENT_KEYWORDS
+         if any(word in text_lower for word in words)),
+        "general_civic_interest"
+    )
+
     # Filter opportunities based on intent (simplified matching)
     relevant_opportunities = []
-    
+
     if "teach" in text_lower or "mentor" in text_lower:
-        relevant_opportunities = [opp for opp in MOCK_OPPORTUNITIES 
-                                if "teaching" in opp.get("skills", [])]
+        relevant_opportunities = OPPORTUNITIES_BY_SKILL.get("teaching", [])
     elif "environment" in text_lower or "beach" in text_lower or "garden" in text_lower:
-        relevant_opportunities = [opp for opp in MOCK_OPPORTUNITIES 
-                                if opp["category"] == "environment"]
+        relevant_opportunities = OPPORTUNITIES_BY_CATEGORY.get("environment", [])
     elif "senior" in text_lower or "elderly" in text_lower:
-        relevant_opportunities = [opp for opp in MOCK_OPPORTUNITIES 
-                                if "senior" in opp["title"].lower()]
+        relevant_opportunities = SENIOR_OPPORTUNITIES
     else:
         # Return a random selection for general queries
         relevant_opportunities = random.sample(MOCK_OPPORTUNITIES, 
@@ -146,7 +157,7 @@ async def propose_action(opportunity_id: str, user_context: Dict[str, Any] = {})
     """
     
     # Find the opportunity
-    opportunity = next((opp for opp in MOCK_OPPORTUNITIES if opp["id"] == opportunity_id), None)
+    opportunity = OPPORTUNITIES_BY_ID.get(opportunity_id)
     
     if not opportunity:
         raise HTTPException(status_code=404, detail="Opportunity not found")